@@ -0,0 +1,120 @@
+import json
+import os
+import struct
+import tempfile
+import numpy as np
+from scipy.spatial.transform import Rotation
+from vmd2miframes import convert_vmd_to_miframes
+
+VMD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dance.vmd")
+
+def convert(vmd_path=VMD_FILE, **kwargs):
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "out.miframes")
+        convert_vmd_to_miframes(vmd_path, output, **kwargs)
+        with open(output, encoding="utf-8") as f:
+            return json.load(f), os.path.getsize(output)
+
+def write_vmd(path, keyframes):
+    """Write a minimal VMD file from (bone_name, frame, pos, quat) tuples"""
+    with open(path, "wb") as f:
+        f.write(b"Vocaloid Motion Data 0002".ljust(30, b"\x00"))
+        f.write(b"test".ljust(20, b"\x00"))
+        f.write(struct.pack("<I", len(keyframes)))
+        for bone_name, frame, pos, quat in keyframes:
+            f.write(bone_name.encode("shift-jis").ljust(15, b"\x00"))
+            f.write(struct.pack("<I7f", frame, *pos, *quat))
+            f.write(b"\x00" * 64)
+
+def test_frame_range():
+    data, _ = convert(frame_range=(1000, 1300))
+    assert data["length"] == 301
+
+    positions = [kf["position"] for kf in data["keyframes"]]
+    assert min(positions) == 0 and max(positions) == 300
+
+    # Bones without a key at the start (e.g. root, knees) get an interpolated key at output frame 0
+    parts_at_start = {kf.get("part_name", "root") for kf in data["keyframes"] if kf["position"] == 0}
+    assert parts_at_start == {"root", "body", "head", "left_arm", "right_arm", "left_leg", "right_leg"}
+    print("SUCCESS: Frame range keeps boundary poses.")
+
+def test_frame_range_interpolates_boundaries():
+    # Neighbouring keys far outside the range: boundary poses are interpolated at start / end
+    quat_90 = Rotation.from_euler("YXZ", [90, 0, 0], degrees=True).as_quat()
+    keyframes = [
+        ("左腕", 0, (0, 0, 0), (0, 0, 0, 1)),
+        ("左腕", 1000, (0, 0, 0), quat_90),
+        ("センター", 0, (0, 0, 0), (0, 0, 0, 1)),
+        ("センター", 1000, (100, 0, 0), (0, 0, 0, 1)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        vmd_path = os.path.join(tmp, "sparse.vmd")
+        write_vmd(vmd_path, keyframes)
+        data, _ = convert(vmd_path, frame_range=(400, 600))
+
+    values = {(kf["position"], kf.get("part_name", "root")): kf["values"] for kf in data["keyframes"]}
+    assert data["length"] == 201
+    assert set(values) == {(0, "root"), (200, "root"), (0, "left_arm"), (200, "left_arm")}
+    # 左腕 maps MMD Y rotation to inverted ROT_Z, センター maps X position to -POS_X * 0.1
+    assert np.isclose(values[(0, "left_arm")]["ROT_Z"], -36.0)
+    assert np.isclose(values[(200, "left_arm")]["ROT_Z"], -54.0)
+    assert np.isclose(values[(0, "root")]["POS_X"], -4.0)
+    assert np.isclose(values[(200, "root")]["POS_X"], -6.0)
+    print("SUCCESS: Boundary poses are interpolated.")
+
+def test_parts():
+    data, _ = convert(parts=["root", "left_arm"])
+    assert {kf.get("part_name", "root") for kf in data["keyframes"]} == {"root", "left_arm"}
+
+    try:
+        convert(parts=["tail"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown part should raise ValueError")
+    print("SUCCESS: Parts filter restricts output.")
+
+def test_preview_step():
+    full, _ = convert(frame_range=(1000, 1300))
+    preview, _ = convert(frame_range=(1000, 1300), preview_step=3)
+    assert preview["tempo"] == 10
+    assert preview["length"] == 101
+    assert len(preview["keyframes"]) <= len(full["keyframes"])
+
+    # Each output frame holds at most one keyframe per part
+    keys = [(kf["position"], kf.get("part_name", "root")) for kf in preview["keyframes"]]
+    assert len(keys) == len(set(keys))
+
+    for kwargs in ({"preview_step": 4}, {"preview_fps": 7}, {"frame_range": (300, 200)}):
+        try:
+            convert(**kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{kwargs} should raise ValueError")
+    print("SUCCESS: Preview decimation keeps tempo exact.")
+
+def test_preview_dense_track():
+    # A key on every frame: preview_step=3 keeps one key in three
+    keyframes = [
+        ("左腕", frame, (0, 0, 0), Rotation.from_euler("YXZ", [frame % 90, 0, 0], degrees=True).as_quat())
+        for frame in range(300)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        vmd_path = os.path.join(tmp, "dense.vmd")
+        write_vmd(vmd_path, keyframes)
+        full, full_size = convert(vmd_path)
+        preview, preview_size = convert(vmd_path, preview_step=3)
+
+    print(f"Dense track keyframes (full / preview): {len(full['keyframes'])} / {len(preview['keyframes'])}")
+    print(f"Dense track size (full / preview): {full_size} / {preview_size}")
+    assert len(full["keyframes"]) == 300
+    assert len(preview["keyframes"]) == 101  # frame 299 rounds to output frame 100
+    assert preview_size < full_size / 2
+
+if __name__ == "__main__":
+    test_frame_range()
+    test_frame_range_interpolates_boundaries()
+    test_parts()
+    test_preview_step()
+    test_preview_dense_track()
@@ -1,6 +1,11 @@
+import os
 import numpy as np
 import matplotlib.pyplot as plt
-from vmd2miframes import apply_smoothing, unwrap_euler_angles
+from vmd2miframes import (apply_smoothing, unwrap_euler_angles, local_poly_smooth, smooth_tracks,
+                          select_smooth_windows, build_bone_tracks, VmdMotion, BONE_MAP,
+                          AUTO_SMOOTH_MAX_DEVIATION)
+
+VMD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dance.vmd")
 
 def test_smoothing():
     # 1. Generate dummy noisy data (sine wave + noise)
@@ -46,5 +51,91 @@ def test_smoothing():
     else:
         print("FAILURE: Angle unwrapping failed.")
 
+def test_gap_aware_smoothing():
+    # 1. Uniform frames: interior matches Savitzky-Golay
+    t = np.arange(100, dtype=float)
+    data = (np.sin(t / 8) * 50 + np.random.normal(0, 5, 100))[:, np.newaxis]
+    smoothed = local_poly_smooth([t], [data], [15], [2])[0]
+    expected = apply_smoothing(data, window_length=15, polyorder=2)
+    assert np.allclose(smoothed[7:-7], expected[7:-7], atol=1e-6)
+
+    # 2. Frames with gaps: a quadratic over real frame times is reproduced exactly
+    t_gap = np.array([0, 1, 2, 10, 11, 30, 31, 32, 60], dtype=float)
+    quad = (0.1 * t_gap ** 2 - t_gap)[:, np.newaxis]
+    smoothed_gap = local_poly_smooth([t_gap], [quad], [15], [2])[0]
+    assert np.allclose(smoothed_gap, quad, atol=1e-5)
+    print("SUCCESS: Gap-aware smoothing fits real frame times.")
+
+def test_sparse_keyframes():
+    # 1. Keys 40 frames apart: nothing else inside a 15-frame window, poses stay untouched
+    t_sparse = np.arange(0, 400, 40, dtype=float)
+    poses = np.tile([0.0, 90.0], 5)[:, np.newaxis]
+    assert np.allclose(local_poly_smooth([t_sparse], [poses], [15], [2])[0], poses)
+
+    # 2. Dense noisy cluster followed by a distant key: the fit must not reach across the gap
+    t_mixed = np.concatenate([np.arange(20, dtype=float), [60.0]])
+    dense = np.random.normal(0, 5, (20, 1))
+    mixed = np.vstack([dense, [[90.0]]])
+    smoothed_mixed = local_poly_smooth([t_mixed], [mixed], [7], [2])[0]
+    smoothed_dense = local_poly_smooth([t_mixed[:20]], [dense], [7], [2])[0]
+    assert np.allclose(smoothed_mixed[:20], smoothed_dense)
+    assert np.isclose(smoothed_mixed[20, 0], 90.0)
+
+    # 3. Empty tracks are returned unchanged
+    empty, _ = local_poly_smooth([np.array([]), t_sparse], [np.zeros((0, 6)), poses], [15, 15], [2, 2])
+    assert empty.shape == (0, 6)
+    print("SUCCESS: Sparse keyframes are not smoothed across gaps.")
+
+def test_auto_window():
+    # Fast limb with little noise vs. slow torso with a lot of jitter
+    t = np.arange(100, dtype=float)
+    fast_true = np.sin(t / 2)[:, np.newaxis] * 90
+    slow_true = np.sin(t / 20)[:, np.newaxis] * 10
+    fast = fast_true + np.random.normal(0, 0.5, (100, 1))
+    slow = slow_true + np.random.normal(0, 3, (100, 1))
+
+    auto = smooth_tracks([t, t], [fast, slow], [None, None], [2, 2])
+    fixed = smooth_tracks([t, t], [fast, slow], [15, 15], [2, 2])
+
+    def rms(a, b):
+        return np.sqrt(np.mean((a - b) ** 2))
+
+    print(f"Fast limb error (auto / fixed 15): {rms(auto[0], fast_true):.4f} / {rms(fixed[0], fast_true):.4f}")
+    print(f"Slow torso error (auto / raw): {rms(auto[1], slow_true):.4f} / {rms(slow, slow_true):.4f}")
+    assert rms(auto[0], fast_true) < rms(fixed[0], fast_true)
+    assert rms(auto[1], slow_true) < rms(slow, slow_true)
+
+def jitter(times, data):
+    """RMS of normalized second divided differences over the actual keys"""
+    h1, h2 = np.diff(times)[:-1], np.diff(times)[1:]
+    w = np.stack([2 / (h1 * (h1 + h2)), -2 / (h1 * h2), 2 / (h2 * (h1 + h2))], axis=1)
+    w /= np.linalg.norm(w, axis=1, keepdims=True)
+    second = w[:, :1] * data[:-2] + w[:, 1:2] * data[1:-1] + w[:, 2:] * data[2:]
+    return np.sqrt(np.sum(second ** 2))
+
+def test_auto_window_dance():
+    # Real dance.vmd tracks: torso jitter drops, limb key poses stay close to the originals
+    tracks = build_bone_tracks(VmdMotion.load(VMD_FILE, bone_names=list(BONE_MAP)).motion_frames)
+    times_list = [t for _, t, _ in tracks]
+    data_list = [d for _, _, d in tracks]
+    smoothed = dict(zip([name for name, _, _ in tracks], smooth_tracks(times_list, data_list, [None] * len(tracks), [2] * len(tracks))))
+    _, bounds = select_smooth_windows(times_list, data_list, [2] * len(tracks))
+    bounds = dict(zip([name for name, _, _ in tracks], bounds))
+
+    for name, t, d in tracks:
+        if name in ("上半身", "上半身2", "下半身", "頭"):
+            before, after = jitter(t, d[:, :3]), jitter(t, smoothed[name][:, :3])
+            print(f"{name} jitter: {before:.1f} -> {after:.1f}")
+            assert after < 0.95 * before
+        if name in ("右腕", "左腕", "右ひじ", "左ひじ", "右足", "左足"):
+            deviation = np.abs(smoothed[name] - d)
+            print(f"{name} deviation: max {deviation[:, :3].max():.2f}, rms {np.sqrt(np.mean(deviation[:, :3] ** 2)):.2f}")
+            assert np.all(deviation <= AUTO_SMOOTH_MAX_DEVIATION * bounds[name] + 1e-9)
+            assert np.all(np.sqrt(np.mean(deviation ** 2, axis=0)) <= bounds[name] + 1e-9)
+
 if __name__ == "__main__":
     test_smoothing()
+    test_gap_aware_smoothing()
+    test_sparse_keyframes()
+    test_auto_window()
+    test_auto_window_dance()
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import vmd_converter
+from vmd_converter import Vmd
+
+VMD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dance.vmd")
+# Checked-in output of the original per-keyframe json.dump exporter for dance.vmd
+BASELINE_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "animation.json")
+
+def check_matches_json_dump(vmd, expected=None):
+    if expected is None:
+        expected = json.dumps(vmd.to_anim_json(), ensure_ascii=False, indent=2)
+
+    saved_orjson = vmd_converter.orjson
+    try:
+        # Both the orjson path (if installed) and the bulk template path must match json.dump byte for byte
+        for encoder in {saved_orjson, None}:
+            vmd_converter.orjson = encoder
+            with tempfile.TemporaryDirectory() as tmp:
+                output = os.path.join(tmp, "out.json")
+                vmd.write_anim_json(output)
+                with open(output, encoding="utf-8") as f:
+                    assert f.read() == expected, f"mismatch with encoder {encoder}"
+    finally:
+        vmd_converter.orjson = saved_orjson
+
+def test_write_anim_json_matches_baseline():
+    vmd = Vmd.from_file(VMD_FILE)
+    vmd.convert_quaternions_to_euler()
+    with open(BASELINE_JSON, encoding="utf-8") as f:
+        baseline = f.read()
+
+    # to_anim_json and both write paths must reproduce the original exporter
+    assert json.dumps(vmd.to_anim_json(), ensure_ascii=False, indent=2) == baseline
+    check_matches_json_dump(vmd, expected=baseline)
+    print("SUCCESS: write_anim_json matches animation.json.")
+
+def test_write_anim_json_non_finite():
+    vmd = Vmd.from_file(VMD_FILE)
+    vmd.convert_quaternions_to_euler()
+    vmd.bone_keyframe_record[0]["Position"]["x"] = float("nan")
+    vmd.bone_keyframe_record[1]["Rotation"]["w"] = float("inf")
+    check_matches_json_dump(vmd)
+    print("SUCCESS: NaN / Inf written as json.dump does.")
+
+def test_write_anim_json_large_values():
+    vmd = Vmd.from_file(VMD_FILE)
+    vmd.convert_quaternions_to_euler()
+    vmd.bone_keyframe_record[0]["Position"]["x"] = 1e16
+    vmd.bone_keyframe_record[1]["Position"]["y"] = -3.4e38
+    check_matches_json_dump(vmd)
+    print("SUCCESS: Large values written as json.dump does.")
+
+if __name__ == "__main__":
+    test_write_anim_json_matches_baseline()
+    test_write_anim_json_non_finite()
+    test_write_anim_json_large_values()
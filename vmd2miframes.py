@@ -3,7 +3,7 @@ import json
 import os
 import sys
 import numpy as np
-from scipy.spatial.transform import Rotation
+from scipy.spatial.transform import Rotation, Slerp
 from scipy.signal import savgol_filter
 
 # ==========================================
@@ -18,7 +18,12 @@ class VmdMotion:
         self.motion_frames = [] 
 
     @staticmethod
-    def load(filepath):
+    def load(filepath, bone_names=None, frame_range=None):
+        """
+        :param bone_names: 只保留这些骨骼 (None 表示全部), 在原始 Shift-JIS 字节上比较, 无关记录不会被解码
+        :param frame_range: (start, end) 闭区间, 只保留该范围内的关键帧, 任一端可为 None
+                            边界上没有关键帧的骨骼, 用范围内外相邻关键帧插值出 start / end 处的关键帧
+        """
         motion = VmdMotion()
         with open(filepath, 'rb') as f:
             data = f.read()
@@ -43,9 +48,28 @@ class VmdMotion:
         print(f"Parsed VMD: {filepath}")
         print(f"Frames: {total_frames}")
 
+        # 骨骼名过滤: 原始字节 -> 名称, 避免对无关记录做 Shift-JIS 解码
+        name_lookup = None
+        if bone_names is not None:
+            name_lookup = {name.encode('shift-jis'): name for name in bone_names}
+
+        start, end = frame_range if frame_range is not None else (None, None)
+        # 范围外的边界关键帧: 骨骼名 -> 关键帧
+        before_start = {}
+        after_end = {}
+        # 范围内第一个/最后一个关键帧
+        first_in = {}
+        last_in = {}
+
         for _ in range(total_frames):
-            bone_name_bytes = data[ptr:ptr+15]
-            bone_name = bone_name_bytes.split(b'\x00')[0].decode('shift-jis', errors='replace')
+            bone_name_bytes = data[ptr:ptr+15].split(b'\x00')[0]
+            if name_lookup is not None:
+                bone_name = name_lookup.get(bone_name_bytes)
+                if bone_name is None:
+                    ptr += 111
+                    continue
+            else:
+                bone_name = bone_name_bytes.decode('shift-jis', errors='replace')
             
             # Frame: Index(I), Pos(3f), Rot(4f), Interpolation(64b)
             frame_data = struct.unpack('<I7f', data[ptr+15:ptr+15+4+28])
@@ -53,18 +77,93 @@ class VmdMotion:
             frame_index = frame_data[0]
             pos = [frame_data[1], frame_data[2], frame_data[3]]
             rot = [frame_data[4], frame_data[5], frame_data[6], frame_data[7]] # x, y, z, w
-            
-            motion.motion_frames.append({
+            frame = {
                 'bone': bone_name,
                 'frame': frame_index,
                 'pos': pos,
                 'rot': rot
-            })
-            
+            }
             ptr += 111
+
+            if start is not None and frame_index < start:
+                if bone_name not in before_start or frame_index >= before_start[bone_name]['frame']:
+                    before_start[bone_name] = frame
+                continue
+            if end is not None and frame_index > end:
+                if bone_name not in after_end or frame_index < after_end[bone_name]['frame']:
+                    after_end[bone_name] = frame
+                continue
+
+            if bone_name not in first_in or frame_index < first_in[bone_name]['frame']:
+                first_in[bone_name] = frame
+            if bone_name not in last_in or frame_index >= last_in[bone_name]['frame']:
+                last_in[bone_name] = frame
+            motion.motion_frames.append(frame)
+
+        # 边界上没有关键帧时, 在 start / end 处插值出关键帧
+        for bone_name, prev_frame in before_start.items():
+            if bone_name in first_in and first_in[bone_name]['frame'] == start:
+                continue
+            next_frame = first_in.get(bone_name) or after_end.get(bone_name)
+            motion.motion_frames.append(interpolate_motion_frame(prev_frame, next_frame, start))
+        for bone_name, next_frame in after_end.items():
+            if bone_name in last_in and last_in[bone_name]['frame'] == end:
+                continue
+            if start == end and bone_name in before_start:
+                continue
+            prev_frame = last_in.get(bone_name) or before_start.get(bone_name)
+            motion.motion_frames.append(interpolate_motion_frame(prev_frame, next_frame, end))
+
+        if name_lookup is not None or frame_range is not None:
+            print(f"Kept frames: {len(motion.motion_frames)}")
             
         return motion
 
+def interpolate_motion_frame(prev_frame, next_frame, frame_index):
+    """
+    在 frame_index 处插值出关键帧: 旋转球面插值 (slerp), 位置线性插值
+    只有一侧关键帧时保持该关键帧的姿势 (不使用 VMD 的贝塞尔插值曲线, 按线性时间近似)
+    """
+    if prev_frame is None or next_frame is None or prev_frame['frame'] == next_frame['frame']:
+        held = prev_frame or next_frame
+        return dict(held, frame=frame_index)
+
+    t = (frame_index - prev_frame['frame']) / (next_frame['frame'] - prev_frame['frame'])
+    slerp = Slerp([0.0, 1.0], Rotation.from_quat([prev_frame['rot'], next_frame['rot']]))
+    pos = (1.0 - t) * np.array(prev_frame['pos']) + t * np.array(next_frame['pos'])
+
+    return {
+        'bone': prev_frame['bone'],
+        'frame': frame_index,
+        'pos': pos.tolist(),
+        'rot': slerp([t]).as_quat()[0].tolist()
+    }
+
+def output_frame_indices(frame_times, start_frame=0, end_frame=None, step=1):
+    """
+    源帧时间 -> 输出帧序号: 相对起始帧, 按步长取最近的输出帧, 限制在 [0, 最后一帧] 内
+    """
+    frame_times = np.asarray(frame_times)
+    indices = np.floor((frame_times - start_frame) / step + 0.5).astype(int)
+    last_idx = None if end_frame is None else int(np.floor((end_frame - start_frame) / step + 0.5))
+    return np.clip(indices, 0, last_idx)
+
+def decimate_motion_frames(motion_frames, start_frame=0, end_frame=None, step=1):
+    """
+    每根骨骼在每个输出帧只保留时间最近的关键帧 (相同时取后者)
+    在欧拉角转换和平滑之前抽帧, 预览模式的计算量随输出帧数减少
+    """
+    frame_times = np.array([f['frame'] for f in motion_frames])
+    indices = output_frame_indices(frame_times, start_frame, end_frame, step)
+    distances = np.abs(frame_times - (start_frame + indices * step))
+
+    kept = {}
+    for f, idx, distance in zip(motion_frames, indices.tolist(), distances.tolist()):
+        key = (f['bone'], idx)
+        if key not in kept or distance <= kept[key][0]:
+            kept[key] = (distance, f)
+    return [f for _, f in kept.values()]
+
 # ==========================================
 # 2. 平滑算法
 # ==========================================
@@ -112,6 +211,194 @@ def apply_smoothing(data, window_length=5, polyorder=2):
         print(f"Smoothing failed: {e}")
         return data
 
+def _as_columns(data):
+    """(N,) 或 (N, D) -> (N, D), 空轨道也适用"""
+    data = np.asarray(data, dtype=np.float64)
+    return data[:, np.newaxis] if data.ndim == 1 else data
+
+# 自动选择窗口时的候选窗口大小 (帧)
+AUTO_SMOOTH_WINDOWS = (3, 5, 7, 9, 11, 15, 21, 31, 45, 61)
+
+# 自动模式下单个关键帧最多偏离原值 AUTO_SMOOTH_MAX_DEVIATION 倍噪声上限
+AUTO_SMOOTH_MAX_DEVIATION = 3.0
+
+# 共享噪声水平取各轨道噪声估计的该分位数, 避免快速运动的四肢抬高噪声水平
+AUTO_SMOOTH_NOISE_QUANTILE = 0.25
+
+def estimate_noise(times, data, polyorder=2):
+    """
+    从高频残差估计噪声标准差 (在实际关键帧上计算, 支持非均匀帧间隔)
+    残差为相邻 polyorder+2 个关键帧的 polyorder+1 阶差商 (消去 polyorder 次多项式),
+    按白噪声方差归一化后取 MAD
+    :param times: 帧时间 (N,)
+    :param data: 输入数据 (N, D)
+    :param polyorder: 平滑使用的多项式阶数
+    :return: 每个通道的噪声标准差 (D,)
+    """
+    times = np.asarray(times, dtype=np.float64)
+    data = _as_columns(data)
+    m = polyorder + 1
+    n = len(times) - m
+    if n <= 0:
+        return np.zeros(data.shape[1])
+
+    # 差商系数: w_j = 1 / prod_{k != j} (t_j - t_k)
+    weights = np.ones((n, m + 1))
+    for j in range(m + 1):
+        for k in range(m + 1):
+            if k != j:
+                diff = times[j:j + n] - times[k:k + n]
+                weights[:, j] /= np.where(diff == 0, 1e-9, diff)
+    residual = sum(weights[:, j:j + 1] * data[j:j + n] for j in range(m + 1))
+    residual /= np.sqrt((weights ** 2).sum(axis=1))[:, np.newaxis]
+
+    return 1.4826 * np.median(np.abs(residual), axis=0)
+
+def local_poly_smooth(times_list, data_list, windows, polyorders):
+    """
+    在实际帧时间上做局部多项式拟合 (所有轨道批量计算)
+    均匀采样时内部点与 Savitzky-Golay 一致, 帧间隔不均匀时按真实时间拟合
+    只使用窗口内的关键帧, 点数不足时降低多项式阶数 (只有不超过 order+1 个点时保持原值)
+    :param times_list: 每条轨道的帧时间 [(N_k,), ...]
+    :param data_list: 每条轨道的数据 [(N_k, D), ...]
+    :param windows: 每条轨道的窗口长度 (帧)
+    :param polyorders: 每条轨道的多项式阶数
+    :return: 平滑后的数据列表
+    """
+    results = [np.asarray(d, dtype=np.float64) for d in data_list]
+    # 空轨道原样返回
+    tracks = [k for k, t in enumerate(times_list) if len(t) > 0]
+    if not tracks:
+        return results
+
+    lengths = np.array([len(times_list[k]) for k in tracks])
+    times = np.concatenate([np.asarray(times_list[k], dtype=np.float64) for k in tracks])
+    data = np.concatenate([results[k].reshape(len(results[k]), -1) for k in tracks])
+    track = np.repeat(np.arange(len(lengths)), lengths)
+
+    windows = np.array([windows[k] + 1 if windows[k] % 2 == 0 else windows[k] for k in tracks])
+    polyorders = np.array([polyorders[k] for k in tracks])
+    # 窗口不大于阶数时不平滑 (与 apply_smoothing 一致)
+    enabled = (windows > polyorders)[track]
+    half = ((windows - 1) / 2.0)[track]
+    order = polyorders[track]
+    max_order = int(polyorders.max())
+
+    # 邻域: 偏移 -K..K 内, 属于同一轨道且帧时间在窗口内
+    K = int(max(windows.max() // 2, 1))
+    offsets = np.arange(-K, K + 1)
+    idx = np.arange(len(times))[:, np.newaxis] + offsets
+    valid = (idx >= 0) & (idx < len(times))
+    idx = np.clip(idx, 0, len(times) - 1)
+    valid &= track[idx] == track[:, np.newaxis]
+
+    dt = times[idx] - times[:, np.newaxis]
+    mask = valid & (np.abs(dt) <= half[:, np.newaxis])
+    mask &= enabled[:, np.newaxis] | (offsets == 0)
+
+    # 以当前点为中心的多项式基, 超出有效阶数的列置零
+    x = dt / np.maximum(half, 1.0)[:, np.newaxis]
+    basis = x[:, :, np.newaxis] ** np.arange(max_order + 1)
+    eff_order = np.minimum(order, mask.sum(axis=1) - 1)
+    eff_order[~enabled] = 0
+    active = np.arange(max_order + 1) <= eff_order[:, np.newaxis]
+    basis = basis * (mask[:, :, np.newaxis] & active[:, np.newaxis, :])
+
+    normal = np.einsum('nkp,nkq->npq', basis, basis)
+    normal += np.eye(max_order + 1) * (~active)[:, :, np.newaxis]
+    normal += np.eye(max_order + 1) * 1e-10
+    rhs = np.einsum('nkp,nkd->npd', basis, data[idx])
+    coeffs = np.linalg.solve(normal, rhs)
+
+    smoothed = np.split(coeffs[:, 0, :], np.cumsum(lengths)[:-1])
+    for k, values in zip(tracks, smoothed):
+        results[k] = values.reshape(results[k].shape)
+    return results
+
+def select_smooth_windows(times_list, data_list, polyorders):
+    """
+    为每条轨道的每个通道自动选择平滑窗口 (所有轨道批量计算):
+    噪声上限 = min(该通道的估计噪声, 所有轨道同一通道估计噪声的 AUTO_SMOOTH_NOISE_QUANTILE 分位数),
+    即各骨骼共享同一噪声水平, 高频成分远超该水平的 (快速运动的四肢) 视为动作本身.
+    从小到大尝试 AUTO_SMOOTH_WINDOWS, 残差 RMS 超过噪声上限时停止, 取之前最后一个窗口
+    :return: (windows, bounds), 均为 [(D,), ...], 窗口长度和噪声上限
+    """
+    data_list = [_as_columns(d) for d in data_list]
+    noise = [estimate_noise(t, d, p) for t, d, p in zip(times_list, data_list, polyorders)]
+
+    # 共享噪声水平: 每个通道在所有轨道上非零噪声估计的低分位数
+    stacked = np.array(noise)
+    floor = np.array([
+        np.quantile(column[column > 0], AUTO_SMOOTH_NOISE_QUANTILE) if np.any(column > 0) else 0.0
+        for column in stacked.T
+    ])
+    bounds = [np.minimum(sigma, floor) for sigma in noise]
+
+    # 每个通道作为单独的轨道
+    channels = [(k, c) for k, d in enumerate(data_list) if len(d) > 0 for c in range(d.shape[1])]
+    chosen = [np.full(d.shape[1], AUTO_SMOOTH_WINDOWS[0]) for d in data_list]
+    for w in AUTO_SMOOTH_WINDOWS[1:]:
+        if not channels:
+            break
+        smoothed = local_poly_smooth(
+            [times_list[k] for k, _ in channels],
+            [data_list[k][:, c] for k, c in channels],
+            [w] * len(channels),
+            [polyorders[k] for k, _ in channels]
+        )
+        still_pending = []
+        for (k, c), s in zip(channels, smoothed):
+            rms = np.sqrt(np.mean((data_list[k][:, c] - s) ** 2))
+            if rms <= bounds[k][c]:
+                chosen[k][c] = w
+                still_pending.append((k, c))
+        channels = still_pending
+
+    return chosen, bounds
+
+def smooth_tracks(times_list, data_list, windows, polyorders):
+    """
+    批量平滑多条轨道, windows 中为 None 的轨道由 select_smooth_windows 按通道自动选择窗口,
+    并把每个关键帧的偏移限制在 AUTO_SMOOTH_MAX_DEVIATION 倍噪声上限内
+    """
+    data_list = [np.asarray(d, dtype=np.float64) for d in data_list]
+    auto = [i for i, w in enumerate(windows) if w is None]
+    if not auto:
+        return local_poly_smooth(times_list, data_list, windows, polyorders)
+
+    fixed = [i for i, w in enumerate(windows) if w is not None]
+    results = [None] * len(data_list)
+    if fixed:
+        smoothed = local_poly_smooth(
+            [times_list[i] for i in fixed],
+            [data_list[i] for i in fixed],
+            [windows[i] for i in fixed],
+            [polyorders[i] for i in fixed]
+        )
+        for i, values in zip(fixed, smoothed):
+            results[i] = values
+
+    auto_data = [_as_columns(data_list[i]) for i in auto]
+    chosen, bounds = select_smooth_windows(
+        [times_list[i] for i in auto], auto_data, [polyorders[i] for i in auto]
+    )
+
+    channels = [(k, c) for k, d in enumerate(auto_data) for c in range(d.shape[1])]
+    smoothed = local_poly_smooth(
+        [times_list[auto[k]] for k, _ in channels],
+        [auto_data[k][:, c] for k, c in channels],
+        [int(chosen[k][c]) for k, c in channels],
+        [polyorders[auto[k]] for k, _ in channels]
+    )
+    auto_results = [d.copy() for d in auto_data]
+    for (k, c), values in zip(channels, smoothed):
+        limit = AUTO_SMOOTH_MAX_DEVIATION * bounds[k][c]
+        auto_results[k][:, c] = auto_data[k][:, c] + np.clip(values - auto_data[k][:, c], -limit, limit)
+    for i, values in zip(auto, auto_results):
+        results[i] = values.reshape(data_list[i].shape)
+
+    return results
+
 # ==========================================
 # 3. 自定义骨骼映射 (V8 Update)
 # ==========================================
@@ -159,13 +446,102 @@ BONE_MAP = {
     "右ひざ":   {"target": "right_leg", "type": "bend", "invert": True}, 
 }
 
+# ==========================================
+# 平滑参数 (按目标部位或骨骼名覆盖, 骨骼名优先)
+# ==========================================
+
+# 字段说明:
+# window: 窗口长度 (帧), None 表示根据噪声自动选择
+# polyorder: 多项式阶数
+# 例: "left_arm": {"window": None}, "上半身": {"window": 21, "polyorder": 3}
+
+SMOOTH_CONFIG = {}
+
+def resolve_smooth_params(bone_name, smooth_window=15, polyorder=2, smooth_config=None):
+    """
+    合并全局默认值、SMOOTH_CONFIG 与 smooth_config, 返回 (window, polyorder)
+    """
+    params = {"window": smooth_window, "polyorder": polyorder}
+    target_part = BONE_MAP.get(bone_name, {}).get('target')
+    for config in (SMOOTH_CONFIG, smooth_config or {}):
+        params.update(config.get(target_part, {}))
+        params.update(config.get(bone_name, {}))
+    return params["window"], params["polyorder"]
+
 # ==========================================
 # 4. 主转换逻辑
 # ==========================================
 
-def convert_vmd_to_miframes(vmd_path, output_path, fps=30, scale_factor=0.1, smooth_window=15):
+def build_bone_tracks(motion_frames):
+    """
+    按骨骼整理 BONE_MAP 中骨骼的关键帧
+    :return: [(bone_name, frame_times (N,), data (N, 6)), ...], data 为解包后的 YXZ 欧拉角 + 位置
+    """
+    bone_frames = {}
+    for f in motion_frames:
+        name = f['bone']
+        if name in BONE_MAP:
+            if name not in bone_frames:
+                bone_frames[name] = []
+            bone_frames[name].append(f)
+
+    tracks = []
+    for bone_name, frames in bone_frames.items():
+        frames.sort(key=lambda x: x['frame'])
+
+        quats = np.array([f['rot'] for f in frames])
+        positions = np.array([f['pos'] for f in frames])
+        frame_times = np.array([f['frame'] for f in frames])
+
+        # 转换四元数到欧拉角, 解包角度 (处理 360 度跳变)
+        r = Rotation.from_quat(quats)
+        euler_unwrapped = unwrap_euler_angles(r.as_euler('YXZ', degrees=True))
+
+        tracks.append((bone_name, frame_times, np.hstack([euler_unwrapped, positions])))
+
+    return tracks
+
+def convert_vmd_to_miframes(vmd_path, output_path, fps=30, scale_factor=0.1, smooth_window=15,
+                            frame_range=None, parts=None, preview_step=1, preview_fps=None,
+                            smooth_polyorder=2, smooth_config=None):
+    """
+    :param smooth_window: 默认平滑窗口 (帧), None 表示按骨骼噪声自动选择
+    :param smooth_polyorder: 默认多项式阶数
+    :param smooth_config: 按部位/骨骼名覆盖平滑参数, 格式同 SMOOTH_CONFIG
+    :param frame_range: (start, end) 只转换该帧范围 (闭区间), 输出从第 0 帧开始
+                        边界处没有关键帧时, 插值出第一帧/最后一帧的姿势
+    :param parts: 只转换这些目标部位 (如 ['root', 'left_arm']), None 表示全部
+    :param preview_step: 预览模式, 每 N 帧输出一帧 (必须能整除 fps), 关键帧移到最近的输出帧
+    :param preview_fps: 预览模式, 按目标帧率抽帧 (必须能整除 fps, 优先于 preview_step)
+    """
+    if parts is not None:
+        parts = set(parts)
+        known_parts = {m['target'] for m in BONE_MAP.values()}
+        unknown = parts - known_parts
+        if unknown:
+            raise ValueError(f"Unknown parts: {sorted(unknown)} (available: {sorted(known_parts)})")
+        bone_names = [name for name, m in BONE_MAP.items() if m['target'] in parts]
+    else:
+        bone_names = list(BONE_MAP)
+
+    if preview_fps is not None:
+        if preview_fps <= 0 or fps % preview_fps != 0:
+            raise ValueError(f"preview_fps must divide fps ({fps}), got {preview_fps}")
+        preview_step = fps // preview_fps
+    if preview_step < 1 or fps % preview_step != 0:
+        raise ValueError(f"preview_step must be >= 1 and divide fps ({fps}), got {preview_step}")
+
+    start_frame = 0
+    end_frame = None
+    if frame_range is not None:
+        start_frame = frame_range[0] or 0
+        end_frame = frame_range[1]
+        if end_frame is not None and start_frame > end_frame:
+            raise ValueError(f"frame_range start must not exceed end, got {frame_range}")
+        frame_range = (start_frame, end_frame)
+
     try:
-        vmd = VmdMotion.load(vmd_path)
+        vmd = VmdMotion.load(vmd_path, bone_names=bone_names, frame_range=frame_range)
     except Exception as e:
         print(f"Error loading VMD: {e}")
         return
@@ -174,7 +550,7 @@ def convert_vmd_to_miframes(vmd_path, output_path, fps=30, scale_factor=0.1, smo
         "format": 34,
         "created_in": "2.0.0",
         "is_model": True,
-        "tempo": fps,
+        "tempo": fps // preview_step,
         "length": 0,
         "keyframes": [],
         "templates": [],
@@ -182,22 +558,26 @@ def convert_vmd_to_miframes(vmd_path, output_path, fps=30, scale_factor=0.1, smo
         "resources": []
     }
 
-    bone_frames = {}
-    for f in vmd.motion_frames:
-        name = f['bone']
-        if name in BONE_MAP:
-            if name not in bone_frames:
-                bone_frames[name] = []
-            bone_frames[name].append(f)
-
     max_frame_idx = 0
     
     # 中间存储字典
     merged_keyframes = {}
 
-    for bone_name, frames in bone_frames.items():
-        frames.sort(key=lambda x: x['frame'])
-        
+    # 1. 抽帧 (每个输出帧只保留一个关键帧), 再整理每条骨骼轨道
+    motion_frames = decimate_motion_frames(vmd.motion_frames, start_frame, end_frame, preview_step)
+    tracks = build_bone_tracks(motion_frames)
+
+    # 2. 平滑处理: 按实际帧时间做局部多项式拟合, 所有骨骼批量计算
+    smooth_params = [resolve_smooth_params(name, smooth_window, smooth_polyorder, smooth_config) for name, _, _ in tracks]
+    smoothed_tracks = smooth_tracks(
+        [times for _, times, _ in tracks],
+        [data for _, _, data in tracks],
+        [window for window, _ in smooth_params],
+        [order for _, order in smooth_params]
+    )
+
+    # 3. 映射到目标部位
+    for (bone_name, frame_times, _), smoothed in zip(tracks, smoothed_tracks):
         mapping = BONE_MAP[bone_name]
         target_part = mapping['target']
         map_type = mapping['type']
@@ -205,26 +585,15 @@ def convert_vmd_to_miframes(vmd_path, output_path, fps=30, scale_factor=0.1, smo
         src_axis = mapping.get('src_axis', 'x') 
         swap_yz = mapping.get('swap_yz', False)
 
-        quats = np.array([f['rot'] for f in frames])
-        positions = np.array([f['pos'] for f in frames])
-        frame_indices = [f['frame'] for f in frames]
+        euler_smooth = smoothed[:, :3]
+        pos_smooth = smoothed[:, 3:]
+
+        # 输出位置: 相对起始帧, 预览模式下按步长取最近的输出帧 (已抽帧, 每个输出帧只有一个关键帧)
+        frame_indices = output_frame_indices(frame_times, start_frame, end_frame, preview_step).tolist()
         
         if len(frame_indices) > 0:
             max_frame_idx = max(max_frame_idx, max(frame_indices))
 
-        # 1. 转换四元数到欧拉角
-        r = Rotation.from_quat(quats)
-        euler_yxz = r.as_euler('YXZ', degrees=True)
-        
-        # 2. 解包角度 (处理 360 度跳变)
-        euler_unwrapped = unwrap_euler_angles(euler_yxz)
-        
-        # 3. 平滑处理 (Savitzky-Golay)
-        euler_smooth = apply_smoothing(euler_unwrapped, window_length=smooth_window)
-        
-        # 如果需要，也可以平滑位置
-        pos_smooth = apply_smoothing(positions, window_length=smooth_window)
-
         for i, idx in enumerate(frame_indices):
             e_y, e_x, e_z = euler_smooth[i]
 
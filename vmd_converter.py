@@ -4,6 +4,29 @@ import struct
 from functools import reduce
 from typing import Dict, List, Tuple, Union, Any
 
+import numpy as np
+
+try:
+    import orjson  # 可选依赖: 更快的 JSON 编码器
+except ImportError:
+    orjson = None
+
+# 单个关键帧在 indent=2 JSON 中的文本模板 (与 json.dump(indent=2) 输出一致)
+_KEYFRAME_TEMPLATE = (
+    "        {\n"
+    "          \"frame\": %d,\n"
+    "          \"position\": [\n"
+    "            %r,\n            %r,\n            %r\n"
+    "          ],\n"
+    "          \"rotation_euler\": [\n"
+    "            %r,\n            %r,\n            %r\n"
+    "          ],\n"
+    "          \"rotation_quaternion\": [\n"
+    "            %r,\n            %r,\n            %r,\n            %r\n"
+    "          ]\n"
+    "        }"
+)
+
 class Vmd:
     def __init__(self):
         self.vision = 0
@@ -228,6 +251,48 @@ class Vmd:
         
         return (round(y_angle, 4), round(x_angle, 4), round(z_angle, 4))
 
+    def to_anim_arrays(self) -> Tuple[Dict[str, Any], List[Tuple[str, np.ndarray, np.ndarray]]]:
+        """
+        按列整理骨骼关键帧, 返回 (metadata, blocks)
+        blocks: [(bone_name, frames (N,), values (N, 10)), ...]
+        values 每行为 position(3) + rotation_euler(3, y/x/z) + rotation_quaternion(4), 已保留 4 位小数
+        骨骼按首次出现顺序排列, 关键帧按帧时间排序
+        """
+        records = self.bone_keyframe_record
+        bone_ids = {}
+        ids = np.fromiter(
+            (bone_ids.setdefault(frame["BoneName"], len(bone_ids)) for frame in records),
+            dtype=np.int64, count=len(records)
+        )
+        frames = np.fromiter((frame["FrameTime"] for frame in records), dtype=np.int64, count=len(records))
+        values = np.array([
+            (
+                frame["Position"]["x"], frame["Position"]["y"], frame["Position"]["z"],
+                frame["RotationEuler"]["y"], frame["RotationEuler"]["x"], frame["RotationEuler"]["z"],
+                frame["Rotation"]["x"], frame["Rotation"]["y"], frame["Rotation"]["z"], frame["Rotation"]["w"]
+            )
+            for frame in records
+        ], dtype=np.float64).reshape(len(records), 10)
+        values = np.round(values, 4)
+
+        # 先按骨骼, 再按帧时间排序 (lexsort 是稳定排序, 同帧保持原顺序)
+        order = np.lexsort((frames, ids))
+        ids, frames, values = ids[order], frames[order], values[order]
+        bounds = np.flatnonzero(np.diff(ids)) + 1
+
+        blocks = list(zip(bone_ids, np.split(frames, bounds), np.split(values, bounds))) if len(records) else []
+
+        metadata = {
+            "vmd_version": self.vision,
+            "model_name": self.model_name,
+            "total_frames": int(frames.max(initial=0)) + 1,
+            "bone_count": len(bone_ids),
+            "total_bone_keyframes": self.bone_keyframe_number,
+            "generated_by": "VMD2JSON Converter"
+        }
+
+        return metadata, blocks
+
     def to_anim_json(self) -> Dict[str, Any]:
         """
         转换为动画JSON格式
@@ -251,52 +316,84 @@ class Vmd:
             ]
         }
         """
-        # 按骨骼名称分组关键帧
-        bone_groups = {}
-        for frame in self.bone_keyframe_record:
-            bone_name = frame["BoneName"]
-            if bone_name not in bone_groups:
-                bone_groups[bone_name] = []
-            
-            pos = frame["Position"]
-            rot_q = frame["Rotation"]
-            rot_e = frame["RotationEuler"]
-            
-            bone_groups[bone_name].append({
-                "frame": frame["FrameTime"],
-                "position": [round(pos["x"], 4), round(pos["y"], 4), round(pos["z"], 4)],
-                "rotation_euler": [round(rot_e["y"], 4), round(rot_e["x"], 4), round(rot_e["z"], 4)],
-                "rotation_quaternion": [round(rot_q["x"], 4), round(rot_q["y"], 4), round(rot_q["z"], 4), round(rot_q["w"], 4)]
-            })
-        
-        # 创建骨骼动画数组
+        return self._anim_json_from_arrays(*self.to_anim_arrays())
+
+    @staticmethod
+    def _anim_json_from_arrays(metadata: Dict[str, Any], blocks: List[Tuple[str, np.ndarray, np.ndarray]]) -> Dict[str, Any]:
         bone_animations = []
-        for bone_name, keyframes in bone_groups.items():
-            # 按帧时间排序
-            keyframes.sort(key=lambda x: x["frame"])
+        for bone_name, frames, values in blocks:
             bone_animations.append({
                 "bone_name": bone_name,
-                "keyframes": keyframes
+                "keyframes": [
+                    {
+                        "frame": frame,
+                        "position": row[0:3],
+                        "rotation_euler": row[3:6],
+                        "rotation_quaternion": row[6:10]
+                    }
+                    for frame, row in zip(frames.tolist(), values.tolist())
+                ]
             })
         
-        # 创建元数据
-        metadata = {
-            "vmd_version": self.vision,
-            "model_name": self.model_name,
-            "total_frames": max(
-                (kf["FrameTime"] for kf in self.bone_keyframe_record), 
-                default=0
-            ) + 1,
-            "bone_count": len(bone_groups),
-            "total_bone_keyframes": self.bone_keyframe_number,
-            "generated_by": "VMD2JSON Converter"
-        }
-        
         return {
             "metadata": metadata,
             "bone_animations": bone_animations
         }
 
+    def write_anim_json(self, json_path: str) -> Dict[str, Any]:
+        """
+        将动画JSON写入文件 (格式同 json.dump(indent=2)), 返回 metadata
+        安装了 orjson 时使用 orjson 编码, 否则按骨骼批量格式化关键帧文本
+        含 NaN / Inf (orjson 输出 null) 或绝对值 >= 1e16 (orjson 输出 1e16 而非 1e+16) 时不使用 orjson
+        """
+        metadata, blocks = self.to_anim_arrays()
+
+        if orjson is not None and all(
+            np.isfinite(values).all() and (np.abs(values) < 1e16).all() for _, _, values in blocks
+        ):
+            anim_data = self._anim_json_from_arrays(metadata, blocks)
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(anim_data, option=orjson.OPT_INDENT_2))
+            return metadata
+
+        metadata_text = json.dumps(metadata, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+
+        bone_texts = []
+        for bone_name, frames, values in blocks:
+            if not np.isfinite(values).all():
+                # NaN / Inf 需要 json 模块的表示方式, 逐个编码
+                keyframes = [
+                    {"frame": frame, "position": row[0:3], "rotation_euler": row[3:6], "rotation_quaternion": row[6:10]}
+                    for frame, row in zip(frames.tolist(), values.tolist())
+                ]
+                keyframes_text = json.dumps(keyframes, indent=2)[2:-2]
+                keyframes_text = "\n".join("      " + line for line in keyframes_text.split("\n"))
+            else:
+                keyframes_text = ",\n".join(
+                    _KEYFRAME_TEMPLATE % (frame, *row)
+                    for frame, row in zip(frames.tolist(), values.tolist())
+                )
+            bone_texts.append(
+                "    {\n"
+                f"      \"bone_name\": {json.dumps(bone_name, ensure_ascii=False)},\n"
+                "      \"keyframes\": [\n"
+                f"{keyframes_text}\n"
+                "      ]\n"
+                "    }"
+            )
+
+        with open(json_path, 'w', encoding='utf-8') as f:
+            f.write("{\n  \"metadata\": ")
+            f.write(metadata_text)
+            f.write(",\n  \"bone_animations\": ")
+            if bone_texts:
+                f.write("[\n" + ",\n".join(bone_texts) + "\n  ]")
+            else:
+                f.write("[]")
+            f.write("\n}")
+
+        return metadata
+
 def convert_vmd_to_json(vmd_path: str, json_path: str, encoding: str = "shift-JIS") -> None:
     """
     转换VMD文件为JSON动画文件
@@ -313,18 +410,14 @@ def convert_vmd_to_json(vmd_path: str, json_path: str, encoding: str = "shift-JI
         # 转换四元数到欧拉角
         vmd.convert_quaternions_to_euler()
         
-        # 生成动画JSON
-        anim_data = vmd.to_anim_json()
-        
-        # 保存为JSON
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(anim_data, f, ensure_ascii=False, indent=2)
+        # 生成并保存动画JSON
+        metadata = vmd.write_anim_json(json_path)
         
         print(f"转换成功! 输出文件: {json_path}")
-        print(f"模型名称: {anim_data['metadata']['model_name']}")
-        print(f"骨骼数量: {anim_data['metadata']['bone_count']}")
-        print(f"总帧数: {anim_data['metadata']['total_frames']}")
-        print(f"骨骼关键帧总数: {anim_data['metadata']['total_bone_keyframes']}")
+        print(f"模型名称: {metadata['model_name']}")
+        print(f"骨骼数量: {metadata['bone_count']}")
+        print(f"总帧数: {metadata['total_frames']}")
+        print(f"骨骼关键帧总数: {metadata['total_bone_keyframes']}")
         
     except Exception as e:
         print(f"转换失败: {str(e)}")